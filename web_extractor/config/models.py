@@ -1,26 +1,64 @@
-from pydantic import BaseModel, Field
-from typing import Dict, List, Optional
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, model_validator
+from typing import Dict, List, Optional, Tuple
 
+# Job configs are validated once per run and then only read, so models are frozen (safe to
+# cache derived data against) and unknown keys are ignored rather than stored.
+MODEL_CONFIG = ConfigDict(frozen=True, extra='ignore', str_strip_whitespace=True)
 
 class SiteConfig(BaseModel):
+    model_config = MODEL_CONFIG
+
     name: str
     base_url: str
 
 class AuthConfig(BaseModel):
+    model_config = MODEL_CONFIG
+
     session_file: Optional[str] = Field(None, description="Path to a session file for authentication.")
 
 class RuntimeConfig(BaseModel):
+    model_config = MODEL_CONFIG
+
     sleep_ms_between_pages: int = 500
-    concurrency: int = 2
+    concurrency: int = Field(2, description="Browser workers, and the cap on page loads in flight at once "
+                                            "across all workers (including batched and prefetched pages).")
     user_agent: str = (
         "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
         "AppleWebKit/537.36 (KHTML, like Gecko) "
         "Chrome/108.0.0.0 Safari/537.36"
     )
     stop_after_n_errors: int = 50
+    max_recorded_errors: int = Field(1000, description="Only the most recent error records are kept for reports.")
+    batch_size: int = Field(4, description="URLs each worker opens as concurrent pages in its browser context. "
+                                           "Their loads still share the `concurrency` cap, so batching overlaps "
+                                           "one page's extraction with another's load without adding requests.")
+    per_host_min_interval_ms: int = Field(0, description="Minimum gap between two requests to the same host.")
+    context_recycle_after: int = Field(
+        50, description="URLs a worker scrapes before replacing its browser context, to bound memory growth."
+    )
+    block_resource_types: List[str] = Field(
+        ["image", "media", "font", "stylesheet"],
+        description="Playwright resource types to abort, e.g. add 'script' for sites that render server-side.",
+    )
+    block_url_patterns: List[str] = Field(
+        [
+            "google-analytics.com",
+            "googletagmanager.com",
+            "doubleclick.net",
+            "facebook.net",
+            "hotjar.com",
+        ],
+        description="Requests whose URL contains any of these substrings are aborted.",
+    )
+    http_cache_file: Optional[str] = Field(
+        None, description="SQLite file for caching HTML documents with ETag/Last-Modified revalidation."
+    )
+    http_cache_max_bytes: int = Field(2_000_000, description="Documents larger than this are not cached.")
 
 class PaginateConfig(BaseModel):
     """Defines how to navigate through multiple pages for a single entity."""
+    model_config = MODEL_CONFIG
+
     type: str  # Currently supports 'next_button'
     selector: Optional[str] = Field(None, description="CSS selector for the 'next' button or link.")
     max_pages: Optional[int] = Field(None, description="An optional limit on how many pages to scrape.")
@@ -30,28 +68,61 @@ class Entity(BaseModel):
     Defines a data structure to be scraped. A job can have multiple entities
     that depend on each other (e.g., scrape a ProductList, then ProductDetail).
     """
+    model_config = MODEL_CONFIG
+
     name: str = Field(..., description="Unique name for the entity, e.g., 'ProductList'.")
     url: Optional[str] = Field(None, description="The starting URL to scrape for this entity.")
     follow_from: Optional[str] = Field(None, description="The source of URLs from a previous entity, e.g., 'ProductList.detail_url'.")
     paginate: Optional[PaginateConfig] = Field(None, description="Pagination rules for this entity, if any.")
     row_selector: str = Field(..., description="CSS selector for the main container of each item.")
     fields: Dict[str, str] = Field(..., description="A dictionary of field names and their CSS selectors.")
+    render: bool = Field(False, description="Always load pages in the browser. When false, pages are first fetched "
+                                            "over plain HTTP and only rendered if the row selector finds nothing "
+                                            "or every field of every row is empty.")
+
+    # (field_name, css_selector, attribute) per field, split once at validation time.
+    _parsed_fields: Tuple[Tuple[str, str, Optional[str]], ...] = PrivateAttr(default=())
+
+    @model_validator(mode='after')
+    def _check_url_source(self) -> "Entity":
+        """An entity starts either from its own `url` or from a previous entity's field, never both."""
+        if bool(self.url) == bool(self.follow_from):
+            raise ValueError(f"Entity '{self.name}' must define exactly one of 'url' or 'follow_from'.")
+        return self
+
+    @model_validator(mode='after')
+    def _parse_field_specs(self) -> "Entity":
+        """Splits each 'selector@attribute' field spec so the scraper never parses it per row."""
+        parsed = []
+        for field_name, selector_str in self.fields.items():
+            selector, _, attribute = selector_str.partition('@')
+            parsed.append((field_name, selector, attribute or None))
+        self._parsed_fields = tuple(parsed)
+        return self
 
 
 
 class ModuleConfig(BaseModel):
+    model_config = MODEL_CONFIG
+
     name: str
     entities: List[Entity]
 class OutputConfig(BaseModel):
+    model_config = MODEL_CONFIG
+
     dir: str = "./output"
     formats: List[str] = ["csv", "json"]
     primary_key: Optional[List[str]] = Field(None, description="List of columns to use for removing duplicates.")
 
 class ReportingConfig(BaseModel):
+    model_config = MODEL_CONFIG
+
     p95_target_seconds: Optional[int] = None
 
 class JobConfig(BaseModel):
     """The complete, top-level configuration for a single scraping job file."""
+    model_config = MODEL_CONFIG
+
     site: SiteConfig
     auth: AuthConfig = Field(default_factory=AuthConfig)
     runtime: RuntimeConfig = Field(default_factory=RuntimeConfig)
@@ -1,19 +1,38 @@
 import logging
+import re
+import httpx
 from pathlib import Path
-from typing import Optional
-from playwright.async_api import async_playwright, Browser, Page
+from typing import Iterable, Optional
+from playwright.async_api import async_playwright, Browser, BrowserContext, Route
 from playwright_stealth import Stealth
 
+from .http_cache import HttpCache
+
 logger = logging.getLogger(__name__)
 
+# Sub-resources that CSS-selector extraction never reads; aborting them saves bandwidth and render time.
+DEFAULT_BLOCKED_RESOURCE_TYPES = ("image", "media", "font", "stylesheet")
+
 class BrowserManager:
     """
     Manages a stealthed Playwright browser, using an optional session file for auth.
     """
 
-    def __init__(self, user_agent: str, headless: bool = True):
+    def __init__(self, user_agent: str, headless: bool = True, block_url_patterns: Iterable[str] = (),
+                 http_cache_file: Optional[str] = None, http_cache_max_bytes: int = 2_000_000,
+                 block_resource_types: Iterable[str] = DEFAULT_BLOCKED_RESOURCE_TYPES):
         self.user_agent = user_agent
         self.headless = headless
+        self.block_url_patterns = tuple(block_url_patterns)
+        # One alternation scans each URL once, however many patterns there are.
+        self._block_url_re = (
+            re.compile("|".join(re.escape(pattern) for pattern in self.block_url_patterns))
+            if self.block_url_patterns else None
+        )
+        self.block_resource_types = frozenset(block_resource_types)
+        self.http_cache_file = http_cache_file
+        self.http_cache_max_bytes = http_cache_max_bytes
+        self._http_cache: HttpCache | None = None
         self._playwright = None
         self._browser: Browser | None = None
         self.stealth = Stealth()
@@ -22,6 +41,9 @@ class BrowserManager:
         logger.info("Starting browser...")
         self._playwright = await async_playwright().start()
         self._browser = await self._playwright.chromium.launch(headless=self.headless)
+        if self.http_cache_file:
+            logger.info(f"Using HTTP document cache at {self.http_cache_file}")
+            self._http_cache = HttpCache(self.http_cache_file, self.http_cache_max_bytes)
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
@@ -29,9 +51,15 @@ class BrowserManager:
             await self._browser.close()
         if self._playwright:
             await self._playwright.stop()
+        if self._http_cache:
+            self._http_cache.close()
         logger.info("Browser shut down.")
 
-    async def new_page(self, session_file: Optional[str] = None) -> Page:
+    async def new_context(self, session_file: Optional[str] = None) -> BrowserContext:
+        """
+        Creates a browser context with the stealth init script installed once, so every
+        page opened from it inherits the script. Contexts are meant to be reused across URLs.
+        """
         if not self._browser:
             raise RuntimeError("Browser is not running. Use within 'async with' block.")
 
@@ -48,10 +76,44 @@ class BrowserManager:
                 logger.info("No session file configured. Creating unauthenticated context.")
             context = await self._browser.new_context(user_agent=self.user_agent)
 
-        page = await context.new_page()
-        await page.add_init_script("""
+        await context.add_init_script("""
             Object.defineProperty(navigator, 'webdriver', {get: () => undefined});
             Object.defineProperty(navigator, 'languages', {get: () => ['en-US', 'en']});
             Object.defineProperty(navigator, 'plugins', {get: () => [1,2,3,4,5]});
         """)
-        return page
+        # Routing costs a protocol round-trip per request, so only intercept when there is work to do.
+        if self.block_resource_types or self.block_url_patterns or self.http_cache_file:
+            await context.route("**/*", self._route_request)
+        return context
+
+    async def export_cookies_to_httpx(self, context: BrowserContext,
+                                      limits: Optional[httpx.Limits] = None) -> httpx.AsyncClient:
+        """
+        Builds an HTTP/2 client carrying the context's cookies and user agent, for fetching
+        pages that do not need a browser to render.
+        """
+        cookies = httpx.Cookies()
+        for cookie in await context.cookies():
+            cookies.set(cookie["name"], cookie["value"], domain=cookie["domain"], path=cookie["path"])
+        return httpx.AsyncClient(
+            http2=True,
+            cookies=cookies,
+            headers={"User-Agent": self.user_agent},
+            follow_redirects=True,
+            timeout=30,
+            limits=limits or httpx.Limits(),
+        )
+
+    async def _route_request(self, route: Route):
+        """
+        Aborts heavy sub-resources and requests matching the URL blocklist (ads, analytics);
+        HTML documents go through the HTTP cache when one is configured.
+        """
+        request = route.request
+        if request.resource_type in self.block_resource_types or (
+                self._block_url_re and self._block_url_re.search(request.url)):
+            await route.abort()
+        elif self._http_cache and request.method == "GET" and request.resource_type == "document":
+            await self._http_cache.handle(route)
+        else:
+            await route.continue_()
@@ -0,0 +1,76 @@
+import re
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from selectolax.lexbor import LexborHTMLParser, LexborNode
+
+# (field_name, css_selector, attribute) as parsed by Entity - attribute is None for element text.
+CompiledField = Tuple[str, str, Optional[str]]
+
+
+def extract_page_html(content: str, row_selector: str, compiled_fields: Sequence[CompiledField],
+                      next_selector: Optional[str]) -> (
+        Tuple[List[Dict[str, Any]], Optional[str], List[Dict[str, Any]]]):
+    """
+    Parses a page's HTML and returns (rows, next-page href, field errors).
+
+    Pure function with no engine or event-loop state, so it can run in a worker thread.
+    """
+    tree = LexborHTMLParser(content)
+    field_errors: List[Dict[str, Any]] = []
+
+    # Extract data from all rows found on the page
+    row_data = [
+        extract_row(row, compiled_fields, field_errors) for row in tree.css(row_selector)
+    ]
+
+    # Find the href for the next page
+    next_href = None
+    if next_selector:
+        next_link_element = tree.css_first(next_selector)
+        if next_link_element:
+            next_href = next_link_element.attributes.get("href")
+
+    return row_data, next_href, field_errors
+
+
+def extract_row(soup: LexborNode, compiled_fields: Sequence[CompiledField],
+                field_errors: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Extracts fields from a single row element (selectolax LexborNode).
+
+    `compiled_fields` is the entity's pre-split field list, so the per-field loop does no
+    string parsing; Lexbor has no reusable compiled-selector object, so the row's bound
+    `css_first` is looked up once and reused for every field.
+    """
+    row_data = {}
+    css_first = soup.css_first
+    for field_name, selector, attribute in compiled_fields:
+        try:
+            element = css_first(selector)
+
+            if element:
+                if attribute:
+                    value = element.attributes.get(attribute)
+                    row_data[field_name] = value.strip() if value else None
+                else:
+                    row_data[field_name] = element.text(strip=True)
+            else:
+                row_data[field_name] = None
+        except Exception as e:
+            row_data[field_name] = None
+            field_errors.append({"field": field_name, "selector": selector, "error": str(e)})
+    return row_data
+
+
+def row_selector_hint(row_selector: str) -> Optional[str]:
+    """
+    Returns a class or id name that must appear verbatim in any HTML where `row_selector`
+    matches, taken from the selector's last compound (the row element itself), or None if the
+    selector has no such token. Lets callers skip parsing documents that cannot contain rows.
+    """
+    if "," in row_selector:
+        return None
+    # Drop attribute selectors and pseudo-class arguments first; they may contain spaces or dots.
+    simplified = re.sub(r"\[[^\]]*\]|\([^)]*\)", "", row_selector.strip())
+    last_compound = re.split(r"\s*[\s>+~]\s*", simplified)[-1]
+    match = re.search(r"[.#]([-\w]+)", last_compound)
+    return match.group(1) if match else None
@@ -0,0 +1,89 @@
+import json
+import logging
+import sqlite3
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+from playwright.async_api import Error as PlaywrightError, Route
+
+logger = logging.getLogger(__name__)
+
+# Headers that describe the wire encoding of the original response, not the stored (decoded) body.
+_UNCACHEABLE_HEADERS = frozenset({"content-encoding", "content-length", "transfer-encoding", "set-cookie"})
+
+
+class HttpCache:
+    """
+    SQLite-backed cache for HTML documents, keyed on URL and revalidated with
+    If-None-Match / If-Modified-Since. An unchanged page costs a 304 instead of a full
+    download, which makes re-running a crawl over the same listing pages nearly free.
+    """
+
+    def __init__(self, path: str, max_body_bytes: int):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.max_body_bytes = max_body_bytes
+        self._db = sqlite3.connect(path)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS documents ("
+            " url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, headers TEXT NOT NULL, body BLOB NOT NULL)"
+        )
+        self._db.commit()
+
+    def close(self):
+        self._db.close()
+
+    async def handle(self, route: Route):
+        """Serves a document request through the cache, falling back to the network as-is."""
+        request = route.request
+        cached = self._lookup(request.url)
+        headers = dict(request.headers)
+        if cached:
+            etag, last_modified, _, _ = cached
+            if etag:
+                headers["if-none-match"] = etag
+            if last_modified:
+                headers["if-modified-since"] = last_modified
+
+        try:
+            response = await route.fetch(headers=headers, max_redirects=0)
+        except PlaywrightError as e:
+            logger.debug(f"Cache fetch failed for {request.url}, continuing uncached: {e}")
+            await route.continue_()
+            return
+
+        if response.status == 304 and cached:
+            _, _, cached_headers, body = cached
+            logger.debug(f"HTTP cache hit (304) for {request.url}")
+            await route.fulfill(status=200, headers=cached_headers, body=body)
+        elif response.status == 200:
+            body = await response.body()
+            self._store(request.url, response.headers, body)
+            await route.fulfill(response=response, body=body)
+        elif 300 <= response.status < 400 and response.status != 304:
+            # Redirects are re-issued by the browser so page URLs and history stay correct; this
+            # is the only case that costs a second request.
+            await route.continue_()
+        else:
+            # Errors (and a 304 to the browser's own conditional request) are passed on as
+            # fetched rather than requested again.
+            await route.fulfill(response=response)
+
+    def _lookup(self, url: str) -> Optional[Tuple[Optional[str], Optional[str], Dict[str, str], bytes]]:
+        row = self._db.execute(
+            "SELECT etag, last_modified, headers, body FROM documents WHERE url = ?", (url,)
+        ).fetchone()
+        if row is None:
+            return None
+        etag, last_modified, headers, body = row
+        return etag, last_modified, json.loads(headers), body
+
+    def _store(self, url: str, response_headers: Dict[str, str], body: bytes):
+        etag = response_headers.get("etag")
+        last_modified = response_headers.get("last-modified")
+        if not (etag or last_modified) or len(body) > self.max_body_bytes:
+            return
+        headers = {k: v for k, v in response_headers.items() if k.lower() not in _UNCACHEABLE_HEADERS}
+        self._db.execute(
+            "INSERT OR REPLACE INTO documents (url, etag, last_modified, headers, body) VALUES (?, ?, ?, ?, ?)",
+            (url, etag, last_modified, json.dumps(headers), body),
+        )
+        self._db.commit()
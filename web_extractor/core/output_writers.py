@@ -0,0 +1,147 @@
+import logging
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, Type
+
+import orjson
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.ipc as pa_ipc
+import pyarrow.parquet as pq
+import xlsxwriter
+
+from ..utils.file_io import WRITE_BUFFER_BYTES
+
+logger = logging.getLogger(__name__)
+
+
+class OutputWriter(ABC):
+    """
+    Writes one output file incrementally from Arrow record batches, so exporting never needs
+    the whole result set in memory at once.
+    """
+
+    def __init__(self, path: Path, schema: pa.Schema):
+        self.path = path
+        self.schema = schema
+
+    @abstractmethod
+    def write_batch(self, batch: pa.RecordBatch):
+        ...
+
+    def close(self):
+        pass
+
+
+class CsvOutputWriter(OutputWriter):
+    def __init__(self, path: Path, schema: pa.Schema):
+        super().__init__(path, schema)
+        self._writer = pa_csv.CSVWriter(path, schema)
+
+    def write_batch(self, batch: pa.RecordBatch):
+        self._writer.write_batch(batch)
+
+    def close(self):
+        self._writer.close()
+
+
+class JsonOutputWriter(OutputWriter):
+    """A JSON array of records, indented two spaces; byte-identical to dumping the full list."""
+
+    def __init__(self, path: Path, schema: pa.Schema):
+        super().__init__(path, schema)
+        self._file = open(path, "wb", buffering=WRITE_BUFFER_BYTES)
+        self._rows_written = 0
+
+    def write_batch(self, batch: pa.RecordBatch):
+        if not batch.num_rows:
+            return
+        # One orjson call per batch; the dumped list minus its "[\n" and "\n]" is exactly the
+        # already-indented run of records that belongs inside the enclosing array.
+        records = orjson.dumps(batch.to_pylist(), option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        self._file.write(b",\n" if self._rows_written else b"[\n")
+        self._file.write(records[2:-2])
+        self._rows_written += batch.num_rows
+
+    def close(self):
+        self._file.write(b"\n]" if self._rows_written else b"[]")
+        self._file.close()
+
+
+class JsonLinesOutputWriter(OutputWriter):
+    """One JSON record per line."""
+
+    def __init__(self, path: Path, schema: pa.Schema):
+        super().__init__(path, schema)
+        self._file = open(path, "wb", buffering=WRITE_BUFFER_BYTES)
+
+    def write_batch(self, batch: pa.RecordBatch):
+        self._file.write(b"".join(orjson.dumps(row, option=orjson.OPT_APPEND_NEWLINE) for row in batch.to_pylist()))
+
+    def close(self):
+        self._file.close()
+
+
+class ParquetOutputWriter(OutputWriter):
+    def __init__(self, path: Path, schema: pa.Schema):
+        super().__init__(path, schema)
+        self._writer = pq.ParquetWriter(path, schema, compression="zstd")
+
+    def write_batch(self, batch: pa.RecordBatch):
+        self._writer.write_batch(batch)
+
+    def close(self):
+        self._writer.close()
+
+
+class FeatherOutputWriter(OutputWriter):
+    """Feather v2, i.e. an Arrow IPC file; the fastest format to load back into Arrow or pandas."""
+
+    def __init__(self, path: Path, schema: pa.Schema):
+        super().__init__(path, schema)
+        self._writer = pa_ipc.new_file(path, schema, options=pa_ipc.IpcWriteOptions(compression="zstd"))
+
+    def write_batch(self, batch: pa.RecordBatch):
+        self._writer.write_batch(batch)
+
+    def close(self):
+        self._writer.close()
+
+
+class XlsxOutputWriter(OutputWriter):
+    """
+    Writes rows straight to the worksheet in xlsxwriter's constant-memory mode, which flushes
+    each row to disk once the next one starts, so memory stays flat however many rows there are.
+    """
+
+    def __init__(self, path: Path, schema: pa.Schema):
+        super().__init__(path, schema)
+        # Scraped text is data: never reinterpret it as formulas, links or numbers.
+        self._workbook = xlsxwriter.Workbook(str(path), {
+            "constant_memory": True,
+            "strings_to_formulas": False,
+            "strings_to_urls": False,
+        })
+        self._worksheet = self._workbook.add_worksheet()
+        self._header_format = self._workbook.add_format({"bold": True})
+        self._worksheet.write_row(0, 0, schema.names, self._header_format)
+        self._next_row = 1
+
+    def write_batch(self, batch: pa.RecordBatch):
+        columns = [column.to_pylist() for column in batch.columns]
+        for values in zip(*columns):
+            self._worksheet.write_row(self._next_row, 0, values)
+            self._next_row += 1
+
+    def close(self):
+        self._workbook.close()
+
+
+OUTPUT_WRITERS: Dict[str, Type[OutputWriter]] = {
+    "csv": CsvOutputWriter,
+    "json": JsonOutputWriter,
+    "jsonl": JsonLinesOutputWriter,
+    "parquet": ParquetOutputWriter,
+    "feather": FeatherOutputWriter,
+    "xlsx": XlsxOutputWriter,
+}
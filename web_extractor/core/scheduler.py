@@ -0,0 +1,54 @@
+import asyncio
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Tuple
+from urllib.parse import urlsplit
+
+# (position in the entity's item list, item dict with a "url" key)
+WorkItem = Tuple[int, Dict[str, Any]]
+
+
+class HostScheduler:
+    """
+    Work queue that slices items by host: each `get_nowait` rotates to the next host with
+    pending work, so parallel workers spread across hosts instead of piling onto one.
+    `throttle` enforces a minimum interval between requests to the same host.
+    """
+
+    def __init__(self, min_interval_ms: int = 0):
+        self._min_interval = min_interval_ms / 1000
+        self._queues: Dict[str, Deque[WorkItem]] = {}
+        self._rotation: Deque[str] = deque()
+        self._next_slot: Dict[str, float] = {}
+
+    def put_nowait(self, work_item: WorkItem):
+        host = urlsplit(work_item[1]["url"]).netloc
+        queue = self._queues.get(host)
+        if queue is None:
+            queue = self._queues[host] = deque()
+        if not queue:
+            self._rotation.append(host)
+        queue.append(work_item)
+
+    def empty(self) -> bool:
+        return not self._rotation
+
+    def get_nowait(self) -> WorkItem:
+        """Pops the next item from the next host in the rotation. Raises IndexError when empty."""
+        host = self._rotation.popleft()
+        queue = self._queues[host]
+        work_item = queue.popleft()
+        if queue:
+            self._rotation.append(host)
+        return work_item
+
+    async def throttle(self, url: str):
+        """Waits until `url`'s host may be hit again, reserving the slot before sleeping."""
+        if self._min_interval <= 0:
+            return
+        host = urlsplit(url).netloc
+        now = time.monotonic()
+        slot = max(now, self._next_slot.get(host, now))
+        self._next_slot[host] = slot + self._min_interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
@@ -1,51 +1,207 @@
-# scraper.py (REVISED)
-
 import logging
 import asyncio
-import time
+import os
+import re
+from time import perf_counter
+import uuid
+import httpx
+import orjson
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from urllib.parse import urljoin
-from bs4 import BeautifulSoup, Tag
-import pandas as pd
-from typing import Any, Dict, List, Optional
-from playwright.async_api import Page, TimeoutError as PlaywrightTimeoutError
+from urllib.parse import urljoin, urlsplit
+from typing import Any, Deque, Dict, List, Optional, Sequence, Set, Tuple
+from pytdigest import TDigest
+from playwright.async_api import BrowserContext, Error as PlaywrightError, Page, TimeoutError as PlaywrightTimeoutError
 from datetime import datetime
 
 from ..utils.reporting import get_git_commit_hash
 from ..config.models import JobConfig, Entity
 from .browser_manager import BrowserManager
+from .html_extractor import CompiledField, extract_page_html, row_selector_hint
+from .output_writers import OUTPUT_WRITERS, OutputWriter
+from .scheduler import HostScheduler
+from .spool import ParquetSpool
 
 logger = logging.getLogger(__name__)
 
+# Runs inside the page and returns only the extracted values plus the next-page href, so the
+# full HTML never has to cross the CDP boundary and a page costs a single round trip. Text is
+# the concatenation of stripped text nodes, matching selectolax's `text(strip=True)` used by
+# the HTML fallback path. ROW_FIELDS and NEXT_HREF are filled in per entity.
+EXTRACT_PAGE_JS_TEMPLATE = """
+() => {
+    const textOf = (element) => {
+        const walker = document.createTreeWalker(element, NodeFilter.SHOW_TEXT);
+        let text = '';
+        while (walker.nextNode()) text += walker.currentNode.nodeValue.trim();
+        return text;
+    };
+    const attrOf = (element, name) => {
+        const value = element.getAttribute(name);
+        return value ? value.trim() : null;
+    };
+    const rows = Array.from(document.querySelectorAll(ROW_SELECTOR), (row) => {
+        let element;
+        return {ROW_FIELDS};
+    });
+    return {rows, nextHref: NEXT_HREF};
+}
+"""
+
+
+def build_extract_page_js(row_selector: str, compiled_fields: Sequence[CompiledField],
+                          next_selector: Optional[str]) -> str:
+    """
+    Generates an entity's in-page extraction function with its selectors inlined, so each
+    page evaluation sends no arguments and runs straight-line code per field.
+    """
+    def js_string(value: str) -> str:
+        return orjson.dumps(value).decode()
+
+    field_exprs = []
+    for field_name, selector, attribute in compiled_fields:
+        value = f"attrOf(element, {js_string(attribute)})" if attribute else "textOf(element)"
+        field_exprs.append(f"{js_string(field_name)}: "
+                           f"(element = row.querySelector({js_string(selector)})) ? {value} : null")
+    if next_selector:
+        next_href = f"document.querySelector({js_string(next_selector)})?.getAttribute('href') ?? null"
+    else:
+        next_href = "null"
+    parts = {"ROW_SELECTOR": js_string(row_selector), "ROW_FIELDS": ", ".join(field_exprs), "NEXT_HREF": next_href}
+    # Single pass, so placeholder names inside user selectors are never substituted.
+    return re.sub("|".join(parts), lambda match: parts[match.group()], EXTRACT_PAGE_JS_TEMPLATE)
+
+
+# Reads only the next-page link's href; used to start loading the next page early.
+NEXT_HREF_JS = """
+(nextSelector) => {
+    const next = document.querySelector(nextSelector);
+    return next ? next.getAttribute('href') : null;
+}
+"""
+
 
 class ScraperEngine:
     def __init__(self, config: JobConfig, browser_manager: BrowserManager):
         self.config = config
         self.browser_manager = browser_manager
+        # Rows are only kept in memory for entities that a later entity follows from;
+        # the output entity's rows are spooled to disk and everything is counted.
         self.data_store: Dict[str, List[Dict[str, Any]]] = {}
-        self.extraction_times: List[float] = []
-        self.errors: List[Dict[str, Any]] = []
+        self.item_counts: Dict[str, int] = {}
+        # Reporting state stays constant-size however long the crawl runs: page load times go
+        # into a t-digest sketch and only the most recent error records are kept.
+        self.extraction_stats = TDigest()
+        self.errors: Deque[Dict[str, Any]] = deque(maxlen=config.runtime.max_recorded_errors)
+        self.errors_total: int = 0
         self.error_count: int = 0
+        # Set once stop_after_n_errors task failures have happened; checked before any browser work.
+        self._abort = asyncio.Event()
+        self._retained_entities = {
+            entity.follow_from.split(".")[0] for entity in config.module.entities if entity.follow_from
+        }
+        self._spools: Dict[str, ParquetSpool] = {}
+        # Spooled rows go to disk in source order (item index, then page) however tasks finish:
+        # the lowest unfinished item writes straight through, later items' pages are held here
+        # until every earlier item is done.
+        self._spool_next_item = 0
+        self._spool_pending: Dict[int, List[Tuple[List[Dict[str, Any]], Dict[str, Any]]]] = {}
+        self._spool_finished: Set[int] = set()
+        # Browser contexts not currently held by a worker, and how many URLs each has scraped.
+        self._idle_contexts: List[BrowserContext] = []
+        self._context_uses: Dict[BrowserContext, int] = {}
+        self._extract_js = {
+            entity.name: build_extract_page_js(entity.row_selector, entity._parsed_fields, self._next_selector(entity))
+            for entity in config.module.entities
+        }
+        self._row_hints = {entity.name: row_selector_hint(entity.row_selector) for entity in config.module.entities}
+        # Output rows are deduplicated as they are spooled: one set lookup per row, and only
+        # the key tuples are held in memory. As with pandas' drop_duplicates on the output frame,
+        # only key columns the output can actually contain count; with none, nothing is dropped.
+        output_columns = self._output_columns(config)
+        self._primary_key = tuple(key for key in config.output.primary_key or () if key in output_columns)
+        if config.output.primary_key and not self._primary_key:
+            logger.warning(f"None of the primary_key columns {config.output.primary_key} are produced; "
+                           f"output rows will not be deduplicated.")
+        self._seen_keys: Set[Tuple[Any, ...]] = set()
+        # Parsed once so root-relative links can be joined without re-parsing the base URL.
+        base = urlsplit(config.site.base_url)
+        self._base_origin = f"{base.scheme}://{base.netloc}" if base.scheme and base.netloc else None
+        # One pooled HTTP/2 client for the direct-fetch path, sized from the same concurrency
+        # setting as the browser workers. Created on first use from a worker's context cookies.
+        concurrency = config.runtime.concurrency
+        # Workers drive batch_size pages each plus prefetches, so this run-wide limit is what keeps
+        # page loads in flight (browser or direct) at `concurrency`, the load put on the site.
+        self._page_load_slots = asyncio.Semaphore(max(1, concurrency))
+        self._http_limits = httpx.Limits(max_connections=concurrency * 4, max_keepalive_connections=concurrency * 2)
+        self._http_client: Optional[httpx.AsyncClient] = None
+        self._http_client_lock = asyncio.Lock()
+        # Dedicated pool for HTML parsing; Lexbor releases the GIL while parsing, and the pool
+        # size caps how many pages are parsed at once independently of the default executor.
+        self._parse_pool = ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1),
+                                              thread_name_prefix="html-parse")
+        # Spool appends (Arrow conversion plus Parquet I/O) run off the event loop; one thread
+        # keeps them ordered and the Parquet writer single-threaded.
+        self._spool_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="spool-write")
+
+    @staticmethod
+    def _output_columns(config: JobConfig) -> Set[str]:
+        """
+        Column names the final entity's rows can have: its own fields plus everything inherited
+        along its follow_from chain.
+        """
+        entities = {entity.name: entity for entity in config.module.entities}
+        columns: Set[str] = set()
+        entity = config.module.entities[-1] if config.module.entities else None
+        visited = set()
+        while entity is not None and entity.name not in visited:
+            visited.add(entity.name)
+            columns.update(entity.fields)
+            entity = entities.get(entity.follow_from.split(".")[0]) if entity.follow_from else None
+        return columns
 
     async def run(self):
         """Main entry point: scrape all entities defined in the config sequentially."""
         logger.info("Starting scraper engine run.")
-        for entity in self.config.module.entities:
-            await self._process_entity_concurrently(entity)
-        logger.info("Scraper engine run finished.")
-        self._save_output()
+        if self.config.module.entities:
+            output_dir = Path(self.config.output.dir)
+            output_dir.mkdir(parents=True, exist_ok=True)
+            final_entity_name = self.config.module.entities[-1].name
+            spool_path = output_dir / f".{final_entity_name}_{uuid.uuid4().hex[:8]}.spool.parquet"
+            self._spools[final_entity_name] = ParquetSpool(spool_path)
+
+        try:
+            for entity in self.config.module.entities:
+                await self._process_entity_concurrently(entity)
+            logger.info("Scraper engine run finished.")
+            self._save_output()
+        finally:
+            for context in self._idle_contexts:
+                try:
+                    await context.close()
+                except PlaywrightError as e:
+                    logger.warning(f"Could not close browser context: {e}")
+            self._idle_contexts.clear()
+            if self._http_client:
+                await self._http_client.aclose()
+            self._parse_pool.shutdown(wait=False, cancel_futures=True)
+            # Let any in-flight append finish before its spool is closed and removed.
+            self._spool_pool.shutdown(wait=True)
+            for spool in self._spools.values():
+                spool.discard()
 
     async def _process_entity_concurrently(self, entity: Entity):
         """
         Scrape a single entity. If it follows from another, it uses the previous
         entity's results as a source for URLs. Handles concurrency.
         """
-        semaphore = asyncio.Semaphore(self.config.runtime.concurrency)
+        self.item_counts[entity.name] = 0
         items_to_process = []
 
         if entity.url:
             # This is a starting entity. It has its own URL.
-            full_url = urljoin(self.config.site.base_url, entity.url)
+            full_url = self._resolve_url(entity.url)
             items_to_process.append({"url": full_url})
         elif entity.follow_from:
             # This entity depends on a previous one.
@@ -56,13 +212,13 @@ class ScraperEngine:
                 return
 
             if source_entity_name in self.data_store:
-                source_data = self.data_store[source_entity_name]
-                for row in source_data:
-                    if row.get(source_field):
+                resolve_url = self._resolve_url
+                append_item = items_to_process.append
+                for row in self.data_store[source_entity_name]:
+                    ref = row.get(source_field)
+                    if ref:
                         # Inherit data from the source row and add the new URL to scrape
-                        item = row.copy()
-                        item["url"] = urljoin(self.config.site.base_url, row[source_field])
-                        items_to_process.append(item)
+                        append_item({**row, "url": resolve_url(ref)})
             else:
                 logger.warning(f"Source entity '{source_entity_name}' for '{entity.name}' not found or has no data.")
 
@@ -72,113 +228,371 @@ class ScraperEngine:
             return
 
         logger.info(f"Processing {len(items_to_process)} items for entity: {entity.name}")
-        tasks = [asyncio.create_task(self._scrape_url_task(item, entity, semaphore)) for item in items_to_process]
-        results_nested = await asyncio.gather(*tasks)
+        self._spool_next_item = 0
+        self._spool_pending.clear()
+        self._spool_finished.clear()
+        # A fixed set of long-lived workers drains the queue, so only `concurrency` tasks exist
+        # regardless of how many URLs there are. The queue interleaves hosts so parallel workers
+        # hit different domains. Results are slotted by queue position to keep source order.
+        work_queue = HostScheduler(self.config.runtime.per_host_min_interval_ms)
+        for index, item in enumerate(items_to_process):
+            work_queue.put_nowait((index, item))
+        # Slots stay None until their item is scraped; no per-item list is allocated up front.
+        results_nested: List[Optional[List[Dict[str, Any]]]] = [None] * len(items_to_process)
+
+        worker_count = min(self.config.runtime.concurrency, len(items_to_process))
+        workers = [asyncio.create_task(self._worker(work_queue, entity, results_nested)) for _ in range(worker_count)]
+        await asyncio.gather(*workers)
+        # Items skipped after an abort never report back; release whatever is still held.
+        await self._release_spooled_rows(entity, *range(len(items_to_process)))
 
         # Flatten the list of lists into a single list of results
-        self.data_store[entity.name] = [item for sublist in results_nested for item in sublist]
-        logger.info(f"Finished entity: {entity.name}. Found {len(self.data_store[entity.name])} total items.")
+        self.data_store[entity.name] = [item for sublist in results_nested if sublist for item in sublist]
+        logger.info(f"Finished entity: {entity.name}. Found {self.item_counts[entity.name]} total items.")
 
-    async def _scrape_url_task(self, item: Dict[str, Any], entity: Entity, semaphore: asyncio.Semaphore) -> List[
-        Dict[str, Any]]:
+    async def _worker(self, work_queue: HostScheduler, entity: Entity, results_nested: List[Optional[List[Dict[str, Any]]]]):
+        """
+        Borrows one browser context from the pool and scrapes queued items with it until the
+        queue is empty, replacing the context every `context_recycle_after` items. Items are taken
+        `batch_size` at a time and their pages are driven concurrently, amortising per-task
+        overhead across the batch.
+        """
+        batch_size = max(1, self.config.runtime.batch_size)
+        recycle_after = self.config.runtime.context_recycle_after
+        if self._abort.is_set():
+            return
+        context = await self._acquire_context()
+        try:
+            client = None if entity.render else await self._get_http_client(context)
+            # Once the run is aborted, remaining queued items are simply left unscraped.
+            while not work_queue.empty() and not self._abort.is_set():
+                if recycle_after > 0 and self._context_uses[context] >= recycle_after:
+                    # Long-lived contexts accumulate memory (route handlers, caches), so start fresh.
+                    # The worker holds no context until the new one is acquired, so a failure
+                    # here never hands the retired one back to the pool.
+                    retired, context = context, None
+                    del self._context_uses[retired]
+                    try:
+                        await retired.close()
+                    except PlaywrightError as e:
+                        logger.warning(f"Could not close recycled browser context: {e}")
+                    context = await self._acquire_context()
+                batch = []
+                while len(batch) < batch_size and not work_queue.empty():
+                    batch.append(work_queue.get_nowait())
+                batch_results = await asyncio.gather(
+                    *(self._scrape_url_task(index, item, entity, context, client, work_queue) for index, item in batch)
+                )
+                for (index, _), rows in zip(batch, batch_results):
+                    results_nested[index] = rows
+                self._context_uses[context] += len(batch)
+        finally:
+            if context is not None and context in self._context_uses:
+                self._idle_contexts.append(context)
+
+    async def _acquire_context(self) -> BrowserContext:
+        """
+        Takes a warm context from the run-wide pool, or opens a new one. Contexts outlive
+        entities, so a follow_from entity starts on the contexts the previous one used.
+        """
+        if self._idle_contexts:
+            return self._idle_contexts.pop()
+        context = await self.browser_manager.new_context(self.config.auth.session_file)
+        self._context_uses[context] = 0
+        return context
+
+    async def _get_http_client(self, context: BrowserContext) -> httpx.AsyncClient:
+        """Returns the shared direct-fetch client, seeding it from `context`'s cookies on first use."""
+        async with self._http_client_lock:
+            if self._http_client is None:
+                self._http_client = await self.browser_manager.export_cookies_to_httpx(context, self._http_limits)
+            return self._http_client
+
+    async def _scrape_url_task(self, index: int, item: Dict[str, Any], entity: Entity, context: BrowserContext,
+                               client: Optional[httpx.AsyncClient], scheduler: HostScheduler) -> List[Dict[str, Any]]:
         """
         A single scraping task. It handles one URL, but that URL might have multiple pages
-        if pagination is configured for the entity.
+        if pagination is configured for the entity. With a `client`, each page is first tried
+        over plain HTTP and a browser page is only opened when rendering turns out to be needed.
         """
-        async with semaphore:
-            if self.error_count >= self.config.runtime.stop_after_n_errors:
-                return []
+        if self._abort.is_set():
+            return []
+
+        # Browser pages are double-buffered: while one page is being extracted, the next page of
+        # the listing is already loading in `spare`. `prefetch` is that in-flight navigation.
+        page = spare = None
+        prefetch: Optional[asyncio.Task] = None
+        all_results_for_task = []
+        current_url = item["url"]
+        initial_data = {k: v for k, v in item.items() if k != "url"}
+        pages_scraped_in_task = 0
+        follow_next = self._next_selector(entity) is not None
+        max_pages = entity.paginate.max_pages if entity.paginate else None
 
-            page = await self.browser_manager.new_page(self.config.auth.session_file)
-            all_results_for_task = []
-            current_url = item["url"]
-            initial_data = {k: v for k, v in item.items() if k != "url"}
-            pages_scraped_in_task = 0
+        try:
+            # This loop handles pagination within a single task.
+            while current_url and not self._abort.is_set():
+                if max_pages and pages_scraped_in_task >= max_pages:
+                    logger.info(f"Reached max_pages limit for {current_url}")
+                    break
+
+                if prefetch is not None:
+                    loaded = await prefetch
+                    prefetch = None
+                    page, spare = spare, page
+                else:
+                    if pages_scraped_in_task:
+                        # Every follow-up page waits, however the previous one was loaded; a
+                        # prefetched page already waited inside _prefetch_page.
+                        await asyncio.sleep(self.config.runtime.sleep_ms_between_pages / 1000)
+                    await scheduler.throttle(current_url)
+                    fetched = await self._fetch_page_direct(client, current_url, entity) if client else None
+                    if fetched is not None:
+                        rows_on_page, next_page_url = fetched
+                        await self._store_rows(entity, index, rows_on_page, initial_data, all_results_for_task)
+                        pages_scraped_in_task += 1
+                        current_url = next_page_url if follow_next else None
+                        continue
+                    if page is None:
+                        page = await context.new_page()
+                    if client:
+                        # The direct fetch already used this host slot; the browser load is another hit.
+                        await scheduler.throttle(current_url)
+                    loaded = await self._load_page(page, current_url, entity)
+
+                rows_on_page, next_page_url = [], None
+                if loaded:
+                    if follow_next and not (max_pages and pages_scraped_in_task + 1 >= max_pages):
+                        next_page_url = await self._peek_next_url(page, entity)
+                        if next_page_url:
+                            if spare is None:
+                                spare = await context.new_page()
+                            prefetch = asyncio.create_task(self._prefetch_page(spare, next_page_url, entity, scheduler))
+                    rows_on_page, extracted_next_url = await self._extract_page(page, current_url, entity)
+                    next_page_url = next_page_url or extracted_next_url
+                await self._store_rows(entity, index, rows_on_page, initial_data, all_results_for_task)
+                pages_scraped_in_task += 1
+
+                # Decide if we should continue to the next page
+                current_url = next_page_url if follow_next else None
+
+        except Exception as e:
+            logger.error(f"Error in scrape task for URL {item['url']}: {e}")
+            self._record_errors({"url": item['url'], "entity": entity.name, "error": str(e)})
+            self.error_count += 1
+            if self.error_count >= self.config.runtime.stop_after_n_errors and not self._abort.is_set():
+                logger.error(f"Reached {self.error_count} errors; stopping the run.")
+                self._abort.set()
+        finally:
+            if prefetch is not None:
+                prefetch.cancel()
+            for open_page in (page, spare):
+                if open_page and not open_page.is_closed():
+                    # Close only the pages; the context stays with the worker for its next URL
+                    await open_page.close()
+
+        await self._release_spooled_rows(entity, index)
+        return all_results_for_task
+
+    def _record_errors(self, *errors: Dict[str, Any]):
+        self.errors_total += len(errors)
+        self.errors.extend(errors)
+
+    def _resolve_url(self, ref: str) -> str:
+        """Resolves `ref` against the site base URL, same result as urljoin."""
+        # Absolute http(s) links come back from urljoin unchanged, and plain root-relative paths
+        # only need the base origin prepended; anything else (relative, protocol-relative, dot
+        # segments) goes through urljoin.
+        if ref.startswith(("https://", "http://")):
+            return ref
+        if self._base_origin and ref.startswith("/") and not ref.startswith("//") and "/." not in ref:
+            return self._base_origin + ref
+        return urljoin(self.config.site.base_url, ref)
+
+    async def _store_rows(self, entity: Entity, index: int, rows: List[Dict[str, Any]], initial_data: Dict[str, Any],
+                          retained: List[Dict[str, Any]]):
+        """
+        Routes one page of extracted rows of item `index`: counted always, appended to the
+        entity's spool if it has one (held back while earlier items are unfinished), and kept
+        in `retained` only when a later entity follows from this one.
 
-            try:
-                # This loop handles pagination within a single task.
-                while current_url:
-                    if entity.paginate and entity.paginate.max_pages and pages_scraped_in_task >= entity.paginate.max_pages:
-                        logger.info(f"Reached max_pages limit for {current_url}")
-                        break
-
-                    rows_on_page, next_page_url = await self._scrape_page(page, current_url, entity, initial_data)
-                    all_results_for_task.extend(rows_on_page)
-                    pages_scraped_in_task += 1
-
-                    # Decide if we should continue to the next page
-                    if entity.paginate and entity.paginate.type == "next_button":
-                        current_url = next_page_url
-                        if current_url:
-                            await asyncio.sleep(self.config.runtime.sleep_ms_between_pages / 1000)
-                    else:
-                        # If no pagination or not 'next_button' type, stop looping.
-                        break
+        `initial_data` (columns inherited from the source row) is shared by every row of the
+        task, so it is broadcast as constant columns by the spool and only merged into per-row
+        dicts for entities that have to be kept in memory.
+        """
+        self.item_counts[entity.name] += len(rows)
+        spool = self._spools.get(entity.name)
+        if spool:
+            if index == self._spool_next_item:
+                await self._submit_spool_write(spool, rows, initial_data)
+            else:
+                self._spool_pending.setdefault(index, []).append((rows, initial_data))
+        if entity.name in self._retained_entities:
+            if initial_data:
+                retained.extend({**initial_data, **row} for row in rows)
+            else:
+                retained.extend(rows)
 
-            except Exception as e:
-                logger.error(f"Error in scrape task for URL {item['url']}: {e}")
-                self.errors.append({"url": item['url'], "entity": entity.name, "error": str(e)})
-                self.error_count += 1
-            finally:
-                if page and not page.is_closed():
-                    # Close the entire browser context to free up resources
-                    await page.context.close()
-
-            return all_results_for_task
-
-    async def _scrape_page(self, page: Page, url: str, entity: Entity, initial_data: Dict[str, Any]) -> (
-    List[Dict[str, Any]], Optional[str]):
-        """Scrapes a single page and returns its data and the URL of the next page, if any."""
+    def _submit_spool_write(self, spool: ParquetSpool, rows: List[Dict[str, Any]],
+                            initial_data: Dict[str, Any]) -> asyncio.Future:
+        """
+        Deduplicates `rows` and queues their append. Submission is synchronous, so appends reach
+        the single spool thread, and first-wins deduplication sees rows, in call order.
+        """
+        if self._primary_key:
+            rows = self._drop_seen_rows(rows, initial_data)
+        return asyncio.get_running_loop().run_in_executor(self._spool_pool, spool.write, rows, initial_data)
+
+    async def _release_spooled_rows(self, entity: Entity, *indices: int):
+        """
+        Marks items as finished and appends the held-back pages of every item that is now next
+        in source order. Runs without awaiting until all appends are queued, so no other task's
+        rows can slip in between.
+        """
+        spool = self._spools.get(entity.name)
+        if not spool:
+            return
+        self._spool_finished.update(index for index in indices if index >= self._spool_next_item)
+        writes = []
+        while self._spool_next_item in self._spool_finished:
+            self._spool_finished.remove(self._spool_next_item)
+            self._spool_next_item += 1
+            for rows, initial_data in self._spool_pending.pop(self._spool_next_item, ()):
+                writes.append(self._submit_spool_write(spool, rows, initial_data))
+        for result in await asyncio.gather(*writes, return_exceptions=True):
+            if isinstance(result, Exception):
+                logger.error(f"Failed to spool rows for entity '{entity.name}': {result}")
+
+    def _drop_seen_rows(self, rows: List[Dict[str, Any]], initial_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Keeps rows whose primary key has not been spooled yet (first one wins, as with pandas'
+        drop_duplicates). Key columns may come from the row or from its inherited data.
+        """
+        new_rows = []
+        for row in rows:
+            key = tuple(row[k] if k in row else initial_data.get(k) for k in self._primary_key)
+            if key not in self._seen_keys:
+                self._seen_keys.add(key)
+                new_rows.append(row)
+        return new_rows
+
+    async def _load_page(self, page: Page, url: str, entity: Entity) -> bool:
+        """Navigates `page` to `url` and waits for the entity's rows. False if they never appear."""
         logger.info(f"Scraping page: {url}")
         try:
-            start_time = time.time()
-            await page.goto(url, wait_until="domcontentloaded", timeout=30000)
-            await page.wait_for_selector(entity.row_selector, timeout=15000)
-            self.extraction_times.append(time.time() - start_time)
+            async with self._page_load_slots:
+                start_time = perf_counter()
+                await page.goto(url, wait_until="commit", timeout=15000)
+                # Extraction reads the DOM, so rows only need to exist, not be laid out and visible.
+                await page.wait_for_selector(entity.row_selector, state="attached", timeout=15000)
+                # The first row can exist while the rest of the document (later rows, the next-page
+                # link) is still streaming in; extraction must see the fully parsed DOM.
+                await page.wait_for_load_state("domcontentloaded", timeout=15000)
+                self.extraction_stats.update(perf_counter() - start_time)
+            return True
         except PlaywrightTimeoutError:
             logger.warning(f"Timeout waiting for selector '{entity.row_selector}' on {url}")
-            return [], None
+            return False
 
-        content = await page.content()
-        soup = BeautifulSoup(content, "lxml")
-        rows = soup.select(entity.row_selector)
-        if not rows:
-            logger.warning(f"Row selector '{entity.row_selector}' found no matches on {url}")
+    async def _prefetch_page(self, page: Page, url: str, entity: Entity, scheduler: HostScheduler) -> bool:
+        """Loads the next listing page in the background, keeping the usual gap between pages."""
+        await asyncio.sleep(self.config.runtime.sleep_ms_between_pages / 1000)
+        await scheduler.throttle(url)
+        return await self._load_page(page, url, entity)
 
-        # Extract data from all rows found on the page
-        row_data = [self._extract_data_from_row(row, entity.fields, initial_data) for row in rows]
+    async def _peek_next_url(self, page: Page, entity: Entity) -> Optional[str]:
+        """Reads just the next-page link, so the next load can start before rows are extracted."""
+        try:
+            next_href = await page.evaluate(NEXT_HREF_JS, self._next_selector(entity))
+        except PlaywrightError:
+            return None  # _extract_page still reports the next link, just without the head start
+        return self._resolve_url(next_href) if next_href else None
 
-        # Find the URL for the next page
-        next_page_url = None
-        if entity.paginate and entity.paginate.type == "next_button" and entity.paginate.selector:
-            next_link_element = soup.select_one(entity.paginate.selector)
-            if next_link_element and next_link_element.get("href"):
-                next_page_url = urljoin(self.config.site.base_url, next_link_element["href"])
+    async def _extract_page(self, page: Page, url: str, entity: Entity) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Extracts a loaded page's fields (without inherited data) and the URL of the next page,
+        if any.
+        """
+        try:
+            extracted = await page.evaluate(self._extract_js[entity.name])
+            row_data = extracted["rows"]
+            next_href = extracted["nextHref"]
+        except PlaywrightError as e:
+            logger.warning(f"In-browser extraction failed on {url}, falling back to HTML parsing: {e}")
+            content = await page.content()
+            # Parse off the event loop so other workers' navigations keep progressing meanwhile.
+            row_data, next_href, field_errors = await self._extract_html(content, entity)
+            self._record_errors(*field_errors)
+
+        if not row_data:
+            logger.warning(f"Row selector '{entity.row_selector}' found no matches on {url}")
 
+        # Resolve the URL for the next page
+        next_page_url = self._resolve_url(next_href) if next_href else None
         return row_data, next_page_url
 
-    def _extract_data_from_row(self, soup: Tag, fields: Dict[str, str], initial_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Extracts fields from a single row element (BeautifulSoup Tag)."""
-        row_data = initial_data.copy()
-        for field_name, selector_str in fields.items():
-            try:
-                parts = selector_str.split('@')
-                selector = parts[0]
-                attribute = parts[1] if len(parts) > 1 else None
-                element = soup.select_one(selector)
-
-                if element:
-                    if attribute:
-                        value = element.get(attribute)
-                        row_data[field_name] = value.strip() if value else None
-                    else:
-                        row_data[field_name] = element.get_text(strip=True)
-                else:
-                    row_data[field_name] = None
-            except Exception as e:
-                row_data[field_name] = None
-                self.errors.append({"field": field_name, "selector": selector_str, "error": str(e)})
-        return row_data
+    async def _fetch_page_direct(self, client: httpx.AsyncClient, url: str, entity: Entity) -> Optional[
+        Tuple[List[Dict[str, Any]], Optional[str]]]:
+        """
+        Fetches and extracts a page without the browser. Returns None when the page has to be
+        rendered instead: a network error, a non-200 response, static HTML in which the row
+        selector matches nothing, or rows whose fields are all empty (a skeleton filled by JS).
+        """
+        try:
+            async with self._page_load_slots:
+                start_time = perf_counter()
+                response = await client.get(url)
+        except httpx.HTTPError as e:
+            logger.debug(f"Direct fetch failed for {url}, rendering in browser: {e}")
+            return None
+        if response.status_code != 200:
+            return None
+        row_hint = self._row_hints[entity.name]
+        if row_hint and row_hint not in response.text:
+            # The row's class/id never occurs in the markup (typically a JS-rendered shell), so
+            # skip parsing a document that cannot match.
+            logger.debug(f"No rows in static HTML of {url}, rendering in browser.")
+            return None
+
+        row_data, next_href, field_errors = await self._extract_html(response.text, entity)
+        if not row_data:
+            logger.debug(f"No rows in static HTML of {url}, rendering in browser.")
+            return None
+        if all(value is None for row in row_data for value in row.values()):
+            logger.debug(f"Rows in static HTML of {url} have no field values, rendering in browser.")
+            return None
+
+        logger.info(f"Scraped page without rendering: {url}")
+        self.extraction_stats.update(perf_counter() - start_time)
+        self._record_errors(*field_errors)
+        return row_data, self._resolve_url(next_href) if next_href else None
+
+    async def _extract_html(self, content: str, entity: Entity) -> Tuple[
+        List[Dict[str, Any]], Optional[str], List[Dict[str, Any]]]:
+        """Runs `extract_page_html` on the parse pool so it overlaps with other workers' I/O."""
+        return await asyncio.get_running_loop().run_in_executor(
+            self._parse_pool, extract_page_html,
+            content, entity.row_selector, entity._parsed_fields, self._next_selector(entity),
+        )
+
+    @staticmethod
+    def _next_selector(entity: Entity) -> Optional[str]:
+        """The next-page link selector, if the entity paginates with a next button."""
+        if entity.paginate and entity.paginate.type == "next_button":
+            return entity.paginate.selector
+        return None
+
+    @staticmethod
+    def _abandon_writer(writer: OutputWriter):
+        """Closes a writer that failed mid-export and removes its partial file."""
+        try:
+            writer.close()
+        except Exception as e:
+            logger.debug(f"Could not close failed writer for {writer.path}: {e}")
+        try:
+            writer.path.unlink(missing_ok=True)
+        except OSError as e:
+            logger.warning(f"Could not remove partial output file {writer.path}: {e}")
 
     def _save_output(self):
         """Saves the final data to the specified formats."""
@@ -191,30 +605,42 @@ class ScraperEngine:
             return
 
         final_entity_name = self.config.module.entities[-1].name
-        final_data = self.data_store.get(final_entity_name)
-        if not final_data:
+        spool = self._spools.get(final_entity_name)
+        if not spool or not spool.rows_written:
             logger.warning(f"No final data was produced for entity '{final_entity_name}' to save.")
             return
 
-        df = pd.DataFrame(final_data)
-        if output_config.primary_key:
-            pk_list = [key for key in output_config.primary_key if key in df.columns]
-            if pk_list:
-                df.drop_duplicates(subset=pk_list, keep='first', inplace=True)
-
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         commit_hash = get_git_commit_hash()
         base_filename = f"{self.config.site.name}_{self.config.module.name}_{final_entity_name}_{timestamp}_{commit_hash}"
 
+        # Every format is written in the same single pass over the spool, batch by batch.
+        schema = spool.schema
+        writers: Dict[str, OutputWriter] = {}
         for format_str in output_config.formats:
-            file_path = output_dir / f"{base_filename}.{format_str.lower()}"
+            format_key = format_str.lower()
+            writer_cls = OUTPUT_WRITERS.get(format_key)
+            if writer_cls is None:
+                logger.error(f"Unsupported output format: {format_str}")
+                continue
+            try:
+                writers[format_key] = writer_cls(output_dir / f"{base_filename}.{format_key}", schema)
+            except Exception as e:
+                logger.error(f"Failed to save output to {format_str}: {e}")
+
+        for batch in spool.iter_batches():
+            for format_key, writer in list(writers.items()):
+                try:
+                    writer.write_batch(batch)
+                except Exception as e:
+                    logger.error(f"Failed to save output to {format_key}: {e}")
+                    del writers[format_key]
+                    self._abandon_writer(writer)
+
+        for format_key, writer in writers.items():
             try:
-                if format_str.lower() == 'csv':
-                    df.to_csv(file_path, index=False, encoding='utf-8')
-                elif format_str.lower() == 'json':
-                    df.to_json(file_path, orient="records", indent=4)
-                elif format_str.lower() == 'xlsx':
-                    df.to_excel(file_path, index=False)
-                logger.info(f"Successfully saved output to {file_path}")
+                writer.close()
+                logger.info(f"Successfully saved output to {writer.path}")
             except Exception as e:
-                logger.error(f"Failed to save output to {format_str}: {e}")
\ No newline at end of file
+                logger.error(f"Failed to save output to {format_key}: {e}")
+                self._abandon_writer(writer)
@@ -0,0 +1,71 @@
+import logging
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+logger = logging.getLogger(__name__)
+
+
+class ParquetSpool:
+    """
+    Appends an entity's scraped rows to a Parquet file one batch at a time, so finished rows
+    sit on disk instead of in memory until the output is written.
+
+    The column set is taken from the first batch; every column is stored as a nullable
+    string, which is what extracted text and attribute values are. Values shared by a whole
+    batch (data inherited from a source row) are passed separately and broadcast as constant
+    columns, so no per-row merged dicts are needed.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.rows_written = 0
+        self._schema: Optional[pa.Schema] = None
+        self._writer: Optional[pq.ParquetWriter] = None
+
+    @property
+    def schema(self) -> Optional[pa.Schema]:
+        """The spooled column schema; None until the first batch is written."""
+        return self._schema
+
+    def write(self, rows: List[Dict[str, Any]], constants: Optional[Dict[str, Any]] = None):
+        if not rows:
+            return
+        constants = constants or {}
+        row_columns = rows[0].keys()
+        if self._writer is None:
+            names = [name for name in constants if name not in row_columns] + list(row_columns)
+            self._schema = pa.schema([(name, pa.string()) for name in names])
+            self._writer = pq.ParquetWriter(self.path, self._schema)
+
+        size = len(rows)
+        columns = []
+        for name in self._schema.names:
+            if name in row_columns:
+                columns.append(pa.array([row.get(name) for row in rows], type=pa.string()))
+            elif name in constants:
+                columns.append(pa.repeat(pa.scalar(constants[name], type=pa.string()), size))
+            else:
+                columns.append(pa.nulls(size, type=pa.string()))
+        self._writer.write_table(pa.Table.from_arrays(columns, schema=self._schema))
+        self.rows_written += size
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def iter_batches(self) -> Iterator[pa.RecordBatch]:
+        """Closes the writer and streams the spooled rows back in write order."""
+        self.close()
+        yield from pq.ParquetFile(self.path).iter_batches()
+
+    def discard(self):
+        """Closes the writer and deletes the spool file."""
+        self.close()
+        try:
+            self.path.unlink(missing_ok=True)
+        except OSError as e:
+            logger.warning(f"Could not remove spool file {self.path}: {e}")
@@ -2,17 +2,30 @@
 
 import asyncio
 import logging
+import os
 from pathlib import Path
 from datetime import datetime
+from typing import Optional
+import orjson
 import yaml
 import typer
 from pydantic import ValidationError
 
+try:
+    import uvloop
+except ImportError:  # uvloop is not available on Windows
+    uvloop = None
+
+try:
+    # LibYAML's C parser, several times faster than the pure-Python one.
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as YamlLoader
+
 # --- Local Imports ---
+# Only the config model is needed up front; the browser, engine and reporting modules pull in
+# Playwright, pandas and pyarrow, so they are imported in run_scrape once a job actually runs.
 from web_extractor.config.models import JobConfig
-from web_extractor.core.browser_manager import BrowserManager
-from web_extractor.core.scraper import ScraperEngine
-from web_extractor.utils.reporting import ReportGenerator
 
 # --- Basic Logging Setup ---
 logging.basicConfig(
@@ -26,17 +39,64 @@ logger = logging.getLogger(__name__)
 app = typer.Typer()
 
 
+def load_job_config(config_path: Path) -> Optional[JobConfig]:
+    """
+    Parses and validates a job config file. Returns None if the file is empty.
+
+    The parsed YAML is cached as JSON next to it (in `.cache/`), keyed on the file's mtime
+    and size, so repeated runs of an unchanged job skip the YAML parse. Only the file's own
+    values are cached; validation, and with it every model default, always runs fresh.
+    """
+    stat = config_path.stat()
+    source_key = [stat.st_mtime_ns, stat.st_size]
+    cache_path = config_path.parent / ".cache" / f"{config_path.stem}.json"
+    try:
+        cached = orjson.loads(cache_path.read_bytes())
+        if isinstance(cached, dict) and cached.get("source") == source_key and cached.get("data"):
+            return JobConfig(**cached["data"])
+    except (OSError, orjson.JSONDecodeError, TypeError):
+        pass  # Missing, unreadable or stale cache; fall through to the YAML source.
+
+    with open(config_path, "r", encoding="utf-8") as f:
+        # The whole file is the job configuration; there is no top-level job key.
+        job_config_dict = yaml.load(f, Loader=YamlLoader)
+
+    if not job_config_dict:
+        return None
+    config = JobConfig(**job_config_dict)
+
+    try:
+        cache_path.parent.mkdir(exist_ok=True)
+        tmp_path = cache_path.with_suffix(".json.tmp")
+        tmp_path.write_bytes(orjson.dumps({"source": source_key, "data": job_config_dict}))
+        os.replace(tmp_path, cache_path)
+    except (OSError, TypeError) as e:  # TypeError: YAML values JSON cannot hold (e.g. !!set)
+        logger.debug(f"Could not write config cache {cache_path}: {e}")
+    return config
+
+
 async def run_scrape(config: JobConfig, headless: bool):
     """
     Initializes and runs the scraper engine, then generates reports.
     (This function does not need any changes)
     """
+    from web_extractor.core.browser_manager import BrowserManager
+    from web_extractor.core.scraper import ScraperEngine
+    from web_extractor.utils.reporting import ReportGenerator
+
     start_time = datetime.now()
     logger.info("Async scrape run started.")
     engine = None
 
     try:
-        async with BrowserManager(user_agent=config.runtime.user_agent, headless=headless) as browser_manager:
+        async with BrowserManager(
+                user_agent=config.runtime.user_agent,
+                headless=headless,
+                block_url_patterns=config.runtime.block_url_patterns,
+                block_resource_types=config.runtime.block_resource_types,
+                http_cache_file=config.runtime.http_cache_file,
+                http_cache_max_bytes=config.runtime.http_cache_max_bytes,
+        ) as browser_manager:
             engine = ScraperEngine(config, browser_manager)
             await engine.run()
     except Exception as e:
@@ -47,9 +107,10 @@ async def run_scrape(config: JobConfig, headless: bool):
             try:
                 report_gen = ReportGenerator(
                     job_name=f"{config.site.name}_{config.module.name}",
-                    all_results=engine.data_store,
-                    errors=engine.errors,
-                    extraction_times=engine.extraction_times,
+                    item_counts=engine.item_counts,
+                    errors=list(engine.errors),
+                    extraction_stats=engine.extraction_stats,
+                    errors_total=engine.errors_total,
                     start_time=start_time,
                     p95_target=config.reporting.p95_target_seconds,
                 )
@@ -84,23 +145,22 @@ def run(
         logger.error(f"Configuration file not found. Please ensure '{config_path}' exists.")
         raise typer.Exit(code=1)
 
+    # --- 2. Load the entire file as the job config ---
     try:
-        with open(config_path, "r", encoding="utf-8") as f:
-            # --- 2. Load the entire file as the job config ---
-            # We no longer look for a job key; the whole file is the configuration.
-            job_config_dict = yaml.safe_load(f)
-
-        if not job_config_dict:
-            logger.error(f"Config file '{config_path}' is empty or invalid.")
-            raise typer.Exit(code=1)
-
-        config = JobConfig(**job_config_dict)
-
+        config = load_job_config(config_path)
     except (yaml.YAMLError, ValidationError) as e:
         logger.error(f"Error loading or validating config for job '{job_name}':\n{e}")
         raise typer.Exit(code=1)
 
-    asyncio.run(run_scrape(config, headless))
+    if config is None:
+        logger.error(f"Config file '{config_path}' is empty or invalid.")
+        raise typer.Exit(code=1)
+
+    # uvloop's libuv-based loop has noticeably less per-task overhead than the default one.
+    if uvloop is not None:
+        uvloop.run(run_scrape(config, headless))
+    else:
+        asyncio.run(run_scrape(config, headless))
     logger.info(f"Job '{job_name}' completed.")
 
 
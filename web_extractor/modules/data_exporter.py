@@ -1,9 +1,22 @@
 import logging
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import pandas as pd
 import json
 
+from ..utils.file_io import WRITE_BUFFER_BYTES
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    # Polars' Rust writers are much faster than pandas'; pandas is the fallback.
+    import polars as pl
+except ImportError:
+    pl = None
+
 logger = logging.getLogger(__name__)
 
 def make_json_serializable(data: Any) -> Any:
@@ -17,8 +30,86 @@ def make_json_serializable(data: Any) -> Any:
     else:
         return str(data)
 
-def export_data(data: List[Dict[str, Any]], job_name: str, formats: List[str] = ["csv", "json"]):
-    """Exports scraped data to the specified formats safely."""
+# Rows per chunk for CSV/JSON writes.
+EXPORT_CHUNK_ROWS = 50_000
+
+
+def _frame_columns(rows: List[Dict[str, Any]]) -> List[str]:
+    """All column names across rows, in first-seen order."""
+    return list(dict.fromkeys(key for row in rows for key in row))
+
+
+def _polars_frame(rows: List[Dict[str, Any]], columns: Optional[List[str]] = None):
+    """A Polars frame for `rows`, or None when Polars is missing or cannot type the values."""
+    if pl is None:
+        return None
+    try:
+        # Scan every row for the schema; scraped columns are often sparse.
+        df = pl.from_dicts(rows, schema=columns, infer_schema_length=None)
+    except pl.exceptions.PolarsError as e:
+        logger.debug(f"Falling back to pandas, rows do not share a schema: {e}")
+        return None
+    if pl.Object in df.dtypes:
+        # Arbitrary Python objects; pandas' writers stringify them.
+        return None
+    return df
+
+
+def _write_csv_chunks(rows: List[Dict[str, Any]], columns: List[str], file_path: Path):
+    # Engine and column types are settled once over all rows, so every chunk of the file is
+    # formatted the same way; only the writing is chunked.
+    df = _polars_frame(rows, columns)
+    # Polars' CSV writer rejects list/struct columns; pandas writes their str().
+    if df is not None and any(dtype.is_nested() for dtype in df.dtypes):
+        df = None
+    if df is None:
+        df = pd.DataFrame(rows, columns=columns)
+    with open(file_path, "w", encoding="utf-8", newline="", buffering=WRITE_BUFFER_BYTES) as f:
+        for start in range(0, len(rows), EXPORT_CHUNK_ROWS):
+            if isinstance(df, pd.DataFrame):
+                df.iloc[start:start + EXPORT_CHUNK_ROWS].to_csv(f, header=start == 0, index=False)
+            else:
+                df.slice(start, EXPORT_CHUNK_ROWS).write_csv(f, include_header=start == 0)
+
+
+def _arrow_safe(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Stringifies object columns (keeping nulls) so pyarrow can write them. The pandas path only
+    runs when Polars could not type the rows, i.e. exactly when columns mix value types.
+    """
+    object_columns = df.select_dtypes(include="object").columns
+    if len(object_columns):
+        values = df[object_columns]
+        df[object_columns] = values.astype(str).where(values.notna(), None)
+    return df
+
+
+def _dump_json(rows: List[Dict[str, Any]]) -> bytes:
+    """Compact UTF-8 JSON for `rows`; orjson when available, anything unknown via str()."""
+    if orjson is not None:
+        return orjson.dumps(rows, default=str, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(rows, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+
+
+def _write_json_chunks(rows: List[Dict[str, Any]], file_path: Path):
+    with open(file_path, "wb", buffering=WRITE_BUFFER_BYTES) as f:
+        f.write(b"[")
+        for start in range(0, len(rows), EXPORT_CHUNK_ROWS):
+            chunk = _dump_json(rows[start:start + EXPORT_CHUNK_ROWS])
+            if start:
+                f.write(b",")
+            f.write(chunk[1:-1])  # records without the chunk's own brackets
+        f.write(b"]")
+
+
+def export_data(data: List[Dict[str, Any]], job_name: str, formats: List[str] = ["csv", "json"],
+                sanitize: bool = False):
+    """
+    Exports scraped data to the specified formats safely.
+
+    Values the writers cannot represent natively are stringified by the writers themselves;
+    pass `sanitize=True` to stringify them up front with `make_json_serializable` instead.
+    """
     if not data:
         logger.warning("No data to export.")
         return
@@ -26,22 +117,40 @@ def export_data(data: List[Dict[str, Any]], job_name: str, formats: List[str] =
     output_dir = Path("output")
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    # Ensure all data is JSON-serializable
-    safe_data = make_json_serializable(data)
-    df = pd.DataFrame(safe_data)
+    # The recursive walk is a full Python pass over every value, so it is opt-in.
+    safe_data = make_json_serializable(data) if sanitize else data
+    columns = _frame_columns(safe_data)
+
+    def full_frame():
+        """Whole-dataset frame for formats that cannot be appended to: Polars if possible."""
+        df = _polars_frame(safe_data, columns)
+        return df if df is not None else pd.DataFrame(safe_data, columns=columns)
 
     for fmt in formats:
         file_path = output_dir / f"{job_name}_results.{fmt}"
         try:
             if fmt.lower() == "csv":
-                df.to_csv(file_path, index=False)
+                _write_csv_chunks(safe_data, columns, file_path)
             elif fmt.lower() == "json":
-                df.to_json(file_path, orient="records", indent=4, force_ascii=False)
+                _write_json_chunks(safe_data, file_path)
             elif fmt.lower() == "xlsx":
-                df.to_excel(file_path, index=False)
+                pd.DataFrame(safe_data, columns=columns).to_excel(file_path, index=False)
+            # Columnar formats are far smaller and faster to reload than CSV; zstd compresses best.
+            elif fmt.lower() == "parquet":
+                df = full_frame()
+                if isinstance(df, pd.DataFrame):
+                    _arrow_safe(df).to_parquet(file_path, compression="zstd", index=False)
+                else:
+                    df.write_parquet(file_path, compression="zstd")
+            elif fmt.lower() == "feather":
+                df = full_frame()
+                if isinstance(df, pd.DataFrame):
+                    _arrow_safe(df).to_feather(file_path, compression="zstd")
+                else:
+                    df.write_ipc(file_path, compression="zstd")
             else:
                 logger.error(f"Unsupported export format: {fmt}")
                 continue
-            logger.info(f"Exported {len(df)} items to {file_path}")
+            logger.info(f"Exported {len(safe_data)} items to {file_path}")
         except Exception as e:
             logger.error(f"Failed to export data to {fmt}: {e}")
@@ -1,16 +1,23 @@
-from typing import Dict, Type, Any
+from functools import lru_cache
+from typing import Dict, Tuple, Type, Any
 from pydantic import BaseModel, create_model
-from .pydantic_type_map import PYTHON_TYPE_MAP
+from .pydantic_type_map import PYTHON_TYPE_MAP, DEFAULT_TYPE_INFO
 
 
 def create_scraped_data_model(schema: Dict[str, Any]) -> Type[BaseModel]:
     """Dynamically creates a Pydantic model from the extraction schema."""
-    field_definitions = {}
-    for field_name, details in schema.items():
-        # Pydantic's create_model expects a tuple of (type, default_value)
-        # We use a helper map to convert our YAML type strings to Python types
-        field_type_info = PYTHON_TYPE_MAP.get(details.type.lower(), (Any, ...))
-        field_definitions[field_name] = field_type_info
+    # Field names and type strings identify the model; the same schema reuses the built class.
+    # Order is kept rather than sorted, since it is the model's field order.
+    fingerprint = tuple((field_name, details.type.lower()) for field_name, details in schema.items())
+    return _model_for(fingerprint)
+
+
+@lru_cache(maxsize=128)
+def _model_for(fingerprint: Tuple[Tuple[str, str], ...]) -> Type[BaseModel]:
+    # Pydantic's create_model expects a tuple of (type, default_value)
+    # We use a helper map to convert our YAML type strings (lowercased above) to Python types
+    type_map, default = PYTHON_TYPE_MAP, DEFAULT_TYPE_INFO
+    field_definitions = {field_name: type_map.get(type_name, default) for field_name, type_name in fingerprint}
 
     # The ** unpacks the dictionary into keyword arguments for create_model
     return create_model('ScrapedDataModel', **field_definitions)
\ No newline at end of file
@@ -1,11 +1,16 @@
+from types import MappingProxyType
 from typing import Any, List, Optional
 
 # A mapping from config string types to a tuple of (Python Type, Default Value)
 # for dynamic Pydantic model creation. `...` means the field is required.
-PYTHON_TYPE_MAP = {
+# Keys are lowercase; the map is read-only so the shared tuples cannot be changed at runtime.
+PYTHON_TYPE_MAP = MappingProxyType({
     "string": (Optional[str], None),
     "list[string]": (Optional[List[str]], None),
     "integer": (Optional[int], None),
     "float": (Optional[float], None),
     "any": (Any, ...),
-}
\ No newline at end of file
+})
+
+# Used for type strings that are not in the map.
+DEFAULT_TYPE_INFO = (Any, ...)
\ No newline at end of file
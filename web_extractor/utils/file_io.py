@@ -0,0 +1,3 @@
+# Write buffer for every export and report file: output runs to many megabytes, and a 1 MiB buffer
+# keeps writes to a few large syscalls. Kept free of imports so any module can share it cheaply.
+WRITE_BUFFER_BYTES = 1 << 20
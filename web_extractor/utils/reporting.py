@@ -1,53 +1,69 @@
-import json
+import csv
 import logging
+import subprocess
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Dict, Any, Optional
-import numpy as np
+import orjson
 import pandas as pd
 from datetime import datetime
 import uuid
-import git
+from pytdigest import TDigest
+
+from .file_io import WRITE_BUFFER_BYTES
 
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=1)
 def get_git_commit_hash() -> str:
-    """Gets the short hash of the current git commit."""
+    """Gets the short hash of the current git commit, looked up once per process."""
     try:
-        repo = git.Repo(search_parent_directories=True)
-        return repo.head.object.hexsha[:7]
-    except (git.InvalidGitRepositoryError, ValueError):
+        result = subprocess.run(["git", "rev-parse", "--short=7", "HEAD"],
+                                capture_output=True, text=True, timeout=5)
+    except (OSError, subprocess.SubprocessError):
         return "nogit"
-
-
-class NumpyJSONEncoder(json.JSONEncoder):
-    """A custom JSON encoder to handle NumPy-specific data types."""
-
-    def default(self, obj):
-        if isinstance(obj, (np.integer, np.int64)):
-            return int(obj)
-        if isinstance(obj, (np.floating, np.float64)):
-            return float(obj)
-        if isinstance(obj, np.ndarray):
-            return obj.tolist()
-        if isinstance(obj, np.bool_):
-            return bool(obj)
-        return super(NumpyJSONEncoder, self).default(obj)
+    return result.stdout.strip() if result.returncode == 0 else "nogit"
 
 
 class ReportGenerator:
-    def __init__(self, job_name: str, all_results: Dict[str, List[Dict[str, Any]]], errors: List[Dict[str, Any]],
-                 extraction_times: List[float], start_time: datetime, p95_target: Optional[int] = None):
+    def __init__(self, job_name: str, item_counts: Dict[str, int], errors: List[Dict[str, Any]],
+                 extraction_stats: TDigest, start_time: datetime, p95_target: Optional[int] = None,
+                 errors_total: Optional[int] = None):
         self.job_name = job_name
-        self.all_results = all_results
+        self.item_counts = item_counts
+        # `errors` may be a capped sample of the most recent failures; `errors_total` is the full count.
         self.errors = errors
-        self.extraction_times = extraction_times
+        self.errors_total = len(errors) if errors_total is None else errors_total
+        self.extraction_stats = extraction_stats
         self.start_time = start_time
         self.end_time = datetime.now()
         self.p95_target = p95_target
         self.run_id = f"{self.start_time.strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
         self.reports_dir = Path("./reports")
         self.reports_dir.mkdir(parents=True, exist_ok=True)
+        # Derived once here and shared by every report.
+        self.items_total = sum(self.item_counts.values())
+        self._errors_df = pd.DataFrame(self.errors) if self.errors else None
+        self.errors_by_type = self._count_errors_by_type()
+        self.p50, self.p95 = self._latency_percentiles()
+
+    def _count_errors_by_type(self) -> pd.Series:
+        """Error records counted by message ('error', else 'exception'), most frequent first."""
+        df_errors = self._errors_df
+        if df_errors is None:
+            return pd.Series(dtype="int64")
+        error_col = 'error' if 'error' in df_errors.columns else 'exception'
+        if error_col not in df_errors.columns:
+            return pd.Series(dtype="int64")
+        return df_errors.groupby(error_col).size().sort_values(ascending=False, kind="stable")
+
+    def _latency_percentiles(self) -> (float, float):
+        if not self.extraction_stats.weight:
+            return 0, 0
+        # One vectorised query walks the digest's centroids once for both quantiles.
+        p50, p95 = self.extraction_stats.inverse_cdf([0.50, 0.95]).round(2)
+        return float(p50), float(p95)
 
     def generate_all_reports(self):
         """Generates all the final report files."""
@@ -58,22 +74,6 @@ class ReportGenerator:
 
     def _generate_run_metrics_json(self):
         """Generates a single, comprehensive run_metrics.json file."""
-        if not self.extraction_times:
-            p50, p95, avg_time, total_duration = 0, 0, 0, 0
-        else:
-            p50 = round(np.percentile(self.extraction_times, 50), 2)
-            p95 = round(np.percentile(self.extraction_times, 95), 2)
-            avg_time = round(np.mean(self.extraction_times), 2)
-            total_duration = round(sum(self.extraction_times), 2)
-
-        errors_by_type = {}
-        if self.errors:
-            df_errors = pd.DataFrame(self.errors)
-            # Use 'error' column if it exists, otherwise use 'exception'
-            error_col = 'error' if 'error' in df_errors.columns else 'exception'
-            if error_col in df_errors.columns:
-                errors_by_type = df_errors.groupby(error_col).size().to_dict()
-
         metrics_data = {
             "run_id": self.run_id,
             "job_name": self.job_name,
@@ -81,21 +81,24 @@ class ReportGenerator:
             "start_time": self.start_time.isoformat(),
             "end_time": self.end_time.isoformat(),
             "duration_seconds": round((self.end_time - self.start_time).total_seconds(), 2),
-            "pages_total": len(self.extraction_times),
-            "items_total": sum(len(data) for data in self.all_results.values()),
-            "p50_seconds": p50,
-            "p95_seconds": p95,
-            "errors_total": len(self.errors),
-            "errors_by_type": errors_by_type,
+            "pages_total": int(self.extraction_stats.weight),
+            "items_total": self.items_total,
+            "p50_seconds": self.p50,
+            "p95_seconds": self.p95,
+            "errors_total": self.errors_total,
+            "errors_by_type": self.errors_by_type.sort_index().to_dict(),
         }
 
         if self.p95_target:
             metrics_data["target_p95_seconds"] = self.p95_target
-            metrics_data["target_met"] = p95 <= self.p95_target
+            metrics_data["target_met"] = self.p95 <= self.p95_target
 
         report_path = self.reports_dir / "run_metrics.json"
-        with open(report_path, 'w', encoding='utf-8') as f:
-            json.dump(metrics_data, f, indent=4, cls=NumpyJSONEncoder)
+        # pandas' group counts are numpy integers, which orjson serializes natively.
+        report_path.write_bytes(orjson.dumps(
+            metrics_data,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE,
+        ))
 
     def _generate_error_report_csv(self):
         """Generates errors.csv with details on each failure."""
@@ -103,16 +106,18 @@ class ReportGenerator:
             logger.info("No errors to report.");
             return
 
-        df = pd.DataFrame(self.errors)
         possible_columns = ["url", "entity", "selector", "exception", "retries", "stage", "error", "field"]
-        df = df.reindex(columns=[col for col in possible_columns if col in df.columns])
+        fieldnames = [col for col in possible_columns if any(col in error for error in self.errors)]
         report_path = self.reports_dir / "errors.csv"
-        df.to_csv(report_path, index=False)
+        # Records are written as-is; keys outside the known columns are dropped, missing ones left blank.
+        with open(report_path, 'w', encoding='utf-8', newline='', buffering=WRITE_BUFFER_BYTES) as f:
+            writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction="ignore")
+            writer.writeheader()
+            writer.writerows(self.errors)
 
     def _generate_run_summary_md(self):
         """Generates a markdown summary of the run."""
-        p95 = round(np.percentile(self.extraction_times, 95), 2) if self.extraction_times else 0
-        total_items = sum(len(data) for data in self.all_results.values())
+        p95 = self.p95
 
         summary_content = f"""
 # Run Summary: {self.job_name}
@@ -122,8 +127,8 @@ class ReportGenerator:
 - **Start Time:** `{self.start_time.isoformat()}`
 - **End Time:** `{self.end_time.isoformat()}`
 - **Total Duration:** `{round((self.end_time - self.start_time).total_seconds(), 2)} seconds`
-- **Total Items Scraped:** `{total_items}`
-- **Total Errors:** `{len(self.errors)}`
+- **Total Items Scraped:** `{self.items_total}`
+- **Total Errors:** `{self.errors_total}`
 - **p95 Page Load Time:** `{p95} seconds`
 """
         if self.p95_target:
@@ -131,11 +136,9 @@ class ReportGenerator:
 
         if self.errors:
             summary_content += "\n## Top Errors:\n"
-            error_col = 'error' if 'error' in pd.DataFrame(self.errors).columns else 'exception'
-            error_summary = pd.DataFrame(self.errors).groupby(error_col).size().nlargest(5)
-            for error_msg, count in error_summary.items():
+            for error_msg, count in self.errors_by_type.head(5).items():
                 summary_content += f"- `{error_msg}`: {count} times\n"
 
         report_path = self.reports_dir / "run_summary.md"
-        with open(report_path, 'w', encoding='utf-8') as f:
-            f.write(summary_content.strip())
\ No newline at end of file
+        # Encoded up front and written in one call.
+        report_path.write_bytes(summary_content.strip().encode('utf-8'))
\ No newline at end of file